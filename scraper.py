@@ -4,41 +4,332 @@ No browser automation to avoid dependency issues.
 """
 import os
 import json
+import functools
+import gzip
+import hashlib
+import logging
 import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import count, islice
 from pathlib import Path
 from urllib.parse import urlparse, urljoin
 import re
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # fall back to the regex extractors
+    lxml_html = None
+
+log = logging.getLogger('sensory')
+
+# Connections kept alive per host, sized so scrape_many workers never churn them
+POOL_SIZE = 32
+
+# Gateway errors are retried with short backoff. Retry-After is ignored so a host
+# can't stall the job past the workflow timeout, and connects retry only once
+# so REQUEST_TIMEOUT's connect limit still fails fast
+RETRY_POLICY = Retry(
+    total=3,
+    connect=1,
+    backoff_factor=0.3,
+    status_forcelist=(502, 503, 504),
+    respect_retry_after_header=False
+)
+
+# Politeness limits applied per host when scraping batches
+PER_HOST_CONCURRENCY = 2
+PER_HOST_MIN_DELAY = 0.5  # seconds between request starts
+
+# (connect, read) timeouts in seconds; unreachable hosts fail fast
+REQUEST_TIMEOUT = (10, 30)
+
+# Bodies are truncated past this many bytes; extraction only needs the top of a page
+MAX_RESPONSE_BYTES = 4 << 20
+
+# How far into a page the regex title lookup searches for <head>
+HEAD_SCAN_CHARS = 65536
+
+# Characters of page text kept in results
+TEXT_PREVIEW_CHARS = 2000
+
+# ETag/Last-Modified validators and results kept between runs
+VALIDATOR_CACHE_PATH = Path("logs") / "etag_cache.json"
+VALIDATOR_CACHE_MAXSIZE = 128  # URLs kept; the least recently stored are evicted first
+
+# Content types that get structure analysis
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Content types whose bodies are never downloaded
+SKIPPED_CONTENT_TYPES = ('image/', 'font/', 'audio/', 'video/')
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    # Advertises br (and zstd) only when urllib3 has a decoder installed for it
+    'Accept-Encoding': DEFAULT_ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# Class-name fragments that mark likely content containers
+CONTENT_AREA_KEYWORDS = ('content', 'article', 'post', 'main')
+
+# Regex extractors, compiled once at import
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_META_DESC_RE = re.compile(r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']*)["\']', re.IGNORECASE)
+_HEADINGS_RE = re.compile(r'<h([1-6])[^>]*>(.*?)</h\1>', re.IGNORECASE | re.DOTALL)
+_LINK_RE = re.compile(r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>(.*?)</a>', re.IGNORECASE | re.DOTALL)
+_IMG_TAG_RE = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+_SRC_ATTR_RE = re.compile(r'\ssrc\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+_ALT_ATTR_RE = re.compile(r'\salt\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+_NON_TEXT_RE = re.compile(
+    r'<script[^>]*>.*?</script>|<style[^>]*>.*?</style>|<[^>]+>',
+    re.IGNORECASE | re.DOTALL
+)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+# One pass over the markup picks up both structural tags and class attributes
+_STRUCTURE_RE = re.compile(
+    r'<(article|main|p|div|script|form|table)\b|class=["\']([^"\']*)["\']',
+    re.IGNORECASE
+)
+
+# Extraction path _parse() takes when a document parses cleanly
+DEFAULT_EXTRACTION_METHOD = 'lxml_parsing' if lxml_html is not None else 'advanced_regex_parsing'
+
+# Static parts of every result, built once per extraction path rather than per scrape/job
+CAPABILITIES_USED = {
+    'lxml_parsing': (
+        'http_requests',
+        'lxml_parsing',
+        'content_analysis',
+        'link_extraction',
+        'image_extraction',
+        'structure_analysis'
+    ),
+    'advanced_regex_parsing': (
+        'http_requests',
+        'regex_parsing',
+        'content_analysis',
+        'link_extraction',
+        'image_extraction',
+        'structure_analysis'
+    )
+}
+
+# Extraction method as reported in results metadata; the regex path keeps its original name
+LEARNING_INSIGHT_METHODS = {
+    'lxml_parsing': 'lxml_parsing',
+    'advanced_regex_parsing': 'regex_based_parsing'
+}
+
+CAPABILITIES = {
+    'lxml_parsing': (
+        "HTTP requests with session management",
+        "Single-pass lxml HTML parsing",
+        "Title and meta description extraction",
+        "Heading structure analysis",
+        "Link and image extraction",
+        "Content structure analysis",
+        "Response header analysis"
+    ),
+    'advanced_regex_parsing': (
+        "HTTP requests with session management",
+        "Advanced regex-based content extraction",
+        "Title and meta description extraction",
+        "Heading structure analysis",
+        "Link and image extraction",
+        "Content structure analysis",
+        "Response header analysis"
+    )
+}
+
+def _text_preview(chunks, max_chars):
+    """Collapse text chunks into a preview of at most ``max_chars`` characters.
+
+    Each chunk is whitespace-collapsed as it arrives, and chunks stop being
+    consumed once the collapsed text exceeds ``max_chars``. Returns the
+    preview, the length of the text gathered and whether gathering stopped
+    early; when it did, the length is a lower bound, not the full text length.
+    """
+    parts = []
+    gathered = 0
+    truncated = False
+    for chunk in chunks:
+        chunk = _WS_RE.sub(' ', chunk).strip()
+        if not chunk:
+            continue
+        parts.append(chunk)
+        gathered += len(chunk) + 1  # plus the joining space
+        if gathered > max_chars:
+            truncated = True
+            break
+    
+    text = ' '.join(parts)
+    if len(text) > max_chars:
+        return text[:max_chars] + "...", len(text), truncated
+    return text, len(text), truncated
+
+@functools.cache
+def _ensure_dirs():
+    """Create the output directories once per process, right before the first write."""
+    for directory in ("screenshots", "logs"):
+        os.makedirs(directory, exist_ok=True)
+
+def _empty_structure():
+    """Return the structure analysis for a document that is not HTML."""
+    return {
+        'has_articles': False,
+        'has_main': False,
+        'paragraph_count': 0,
+        'div_count': 0,
+        'script_count': 0,
+        'form_count': 0,
+        'table_count': 0,
+        'content_areas': 0
+    }
+
+_session = None
+
+def get_session():
+    """Return the process-wide HTTP session, creating it on first use."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=RETRY_POLICY)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _session = session
+    return _session
+
+def close_session():
+    """Close the shared HTTP session and its pooled connections."""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
+def send_callback(hub_url, api_key, result):
+    """POST a job result to the hub as gzipped JSON over the shared session."""
+    return get_session().post(
+        f"{hub_url}/api/v1/callbacks/sensory",
+        data=gzip.compress(dump_json(result, indent=False)),
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip"
+        },
+        timeout=30
+    )
+
+def dump_json(obj, indent=True):
+    """Serialize an object to JSON bytes, indented unless ``indent`` is false."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
 class ReliableScraper:
     """Reliable scraper that works in GitHub Actions without browser dependencies."""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        self.session = get_session()
+        
+        # Per-host pacing state shared by scrape_many workers
+        self._host_lock = threading.Lock()
+        self._host_slots = {}
+        self._next_hit = {}
+        
+        # Distinguishes page-info files when a batch scrapes the same URL twice in a second
+        self._page_info_seq = count(1)
+        
+        # url -> {'etag', 'last_modified', 'result'} for conditional re-fetches, oldest first
+        self._cache_lock = threading.Lock()
+        self._validator_cache = self._load_validator_cache()
+        self._validator_cache_dirty = False
+    
+    def _load_validator_cache(self):
+        """Load cached validators and results from a previous run, if any."""
+        try:
+            cache = json.loads(VALIDATOR_CACHE_PATH.read_bytes())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict):
+            return {}
+        # Files written before the size cap could hold any number of entries
+        return dict(list(cache.items())[-VALIDATOR_CACHE_MAXSIZE:])
+    
+    def save_validator_cache(self):
+        """Persist validators and results so later runs can send conditional requests.
+
+        Nothing is written unless a scrape stored new validators since the last save.
+        """
+        with self._cache_lock:
+            if not self._validator_cache_dirty:
+                return
+            payload = dump_json(self._validator_cache, indent=False)
+            self._validator_cache_dirty = False
         
-        # Create directories
-        Path("screenshots").mkdir(exist_ok=True)
-        Path("logs").mkdir(exist_ok=True)
+        _ensure_dirs()
+        VALIDATOR_CACHE_PATH.write_bytes(payload)
+    
+    def _store_validators(self, url, etag, last_modified, result):
+        """Cache a URL's validators and result, evicting the oldest entries past the cap."""
+        with self._cache_lock:
+            # Re-inserting moves the URL to the newest end of the dict
+            self._validator_cache.pop(url, None)
+            self._validator_cache[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'result': result
+            }
+            while len(self._validator_cache) > VALIDATOR_CACHE_MAXSIZE:
+                del self._validator_cache[next(iter(self._validator_cache))]
+            self._validator_cache_dirty = True
+    
+    def _conditional_headers(self, url):
+        """Build If-None-Match/If-Modified-Since headers for a previously scraped URL."""
+        entry = self._validator_cache.get(url)
+        if not entry:
+            return {}
+        
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
     
     def extract_title(self, html_content):
         """Extract title from HTML."""
-        title_match = re.search(r'<title[^>]*>(.*?)</title>', html_content, re.IGNORECASE | re.DOTALL)
+        # The title belongs in <head>, so only scan up to </head> (or the first 64 KiB)
+        head = html_content[:HEAD_SCAN_CHARS]
+        head_end = head.lower().find('</head>')
+        if head_end > 0:
+            head = head[:head_end]
+        title_match = _TITLE_RE.search(head)
         if title_match:
             return title_match.group(1).strip()
         return "No title found"
     
     def extract_meta_description(self, html_content):
         """Extract meta description."""
-        desc_match = re.search(r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']*)["\']', html_content, re.IGNORECASE)
+        desc_match = _META_DESC_RE.search(html_content)
         if desc_match:
             return desc_match.group(1).strip()
         return ""
@@ -46,26 +337,34 @@ class ReliableScraper:
     def extract_headings(self, html_content):
         """Extract headings from HTML."""
         headings = []
-        for level in range(1, 7):
-            pattern = f'<h{level}[^>]*>(.*?)</h{level}>'
-            matches = re.findall(pattern, html_content, re.IGNORECASE | re.DOTALL)
-            for match in matches[:5]:  # Limit to 5 per level
-                clean_text = re.sub(r'<[^>]+>', '', match).strip()
-                if clean_text:
-                    headings.append({
-                        'level': level,
-                        'text': clean_text[:200]  # Limit length
-                    })
+        per_level = [0] * 7
+        captured = 0
+        for match in _HEADINGS_RE.finditer(html_content):
+            level = int(match.group(1))
+            if per_level[level] >= 5:  # Limit to 5 per level
+                continue
+            per_level[level] += 1
+            captured += 1
+            clean_text = _TAG_RE.sub('', match.group(2)).strip()
+            if clean_text:
+                headings.append({
+                    'level': level,
+                    'text': clean_text[:200]  # Limit length
+                })
+            if captured == 30:  # every level is full
+                break
+        
+        # Group by level as before; the sort is stable so document order is kept
+        headings.sort(key=lambda heading: heading['level'])
         return headings
     
     def extract_links(self, html_content, base_url):
         """Extract links from HTML."""
         links = []
-        link_pattern = r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>(.*?)</a>'
-        matches = re.findall(link_pattern, html_content, re.IGNORECASE | re.DOTALL)
-        
-        for href, text in matches[:20]:  # Limit to 20 links
-            clean_text = re.sub(r'<[^>]+>', '', text).strip()
+        # finditer + islice stops scanning once the cap is reached
+        for match in islice(_LINK_RE.finditer(html_content), 20):  # Limit to 20 links
+            href, text = match.groups()
+            clean_text = _TAG_RE.sub('', text).strip()
             if clean_text and href:
                 # Convert relative URLs to absolute
                 if href.startswith('http'):
@@ -83,10 +382,16 @@ class ReliableScraper:
     def extract_images(self, html_content, base_url):
         """Extract images from HTML."""
         images = []
-        img_pattern = r'<img[^>]*src=["\']([^"\']*)["\'][^>]*(?:alt=["\']([^"\']*)["\'])?[^>]*>'
-        matches = re.findall(img_pattern, html_content, re.IGNORECASE)
-        
-        for src, alt in matches[:10]:  # Limit to 10 images
+        seen = 0
+        # Match whole <img> tags, then read src/alt in whatever order they appear
+        for match in _IMG_TAG_RE.finditer(html_content):
+            tag = match.group()
+            src_match = _SRC_ATTR_RE.search(tag)
+            if not src_match:
+                continue
+            seen += 1
+            
+            src = src_match.group(1)
             if src:
                 # Convert relative URLs to absolute
                 if src.startswith('http'):
@@ -94,112 +399,286 @@ class ReliableScraper:
                 else:
                     full_url = urljoin(base_url, src)
                 
+                alt_match = _ALT_ATTR_RE.search(tag)
                 images.append({
                     'src': full_url,
-                    'alt': alt or ''
+                    'alt': alt_match.group(1) if alt_match else ''
                 })
+            
+            if seen == 10:  # Limit to 10 images
+                break
         
         return images
     
-    def extract_text_content(self, html_content):
-        """Extract clean text content."""
-        # Remove script and style elements
-        html_content = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.IGNORECASE | re.DOTALL)
-        html_content = re.sub(r'<style[^>]*>.*?</style>', '', html_content, flags=re.IGNORECASE | re.DOTALL)
-        
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', ' ', html_content)
+    def extract_text_content(self, html_content, max_chars=TEXT_PREVIEW_CHARS):
+        """Extract a clean text preview, its length and whether the scan stopped early."""
+        def text_chunks():
+            # Text between script/style blocks and tags, yielded lazily so the scan can stop early
+            position = 0
+            for match in _NON_TEXT_RE.finditer(html_content):
+                yield html_content[position:match.start()]
+                position = match.end()
+            yield html_content[position:]
         
-        # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        return _text_preview(text_chunks(), max_chars)
     
     def analyze_content_structure(self, html_content):
         """Analyze the structure of the content."""
+        # Skip the scan for payloads that don't look like an HTML document at all
+        prefix = html_content[:1024].lower()
+        if '<html' not in prefix and '<body' not in prefix and '<!doctype html' not in prefix:
+            return _empty_structure()
+        
+        tag_counts = Counter()
+        content_areas = 0
+        for match in _STRUCTURE_RE.finditer(html_content):
+            tag, class_name = match.groups()
+            if tag:
+                tag_counts[tag.lower()] += 1
+            else:
+                class_name = class_name.lower()
+                content_areas += sum(keyword in class_name for keyword in CONTENT_AREA_KEYWORDS)
+        
         analysis = {
-            'has_articles': bool(re.search(r'<article[^>]*>', html_content, re.IGNORECASE)),
-            'has_main': bool(re.search(r'<main[^>]*>', html_content, re.IGNORECASE)),
-            'paragraph_count': len(re.findall(r'<p[^>]*>', html_content, re.IGNORECASE)),
-            'div_count': len(re.findall(r'<div[^>]*>', html_content, re.IGNORECASE)),
-            'script_count': len(re.findall(r'<script[^>]*>', html_content, re.IGNORECASE)),
-            'form_count': len(re.findall(r'<form[^>]*>', html_content, re.IGNORECASE)),
-            'table_count': len(re.findall(r'<table[^>]*>', html_content, re.IGNORECASE))
+            'has_articles': tag_counts['article'] > 0,
+            'has_main': tag_counts['main'] > 0,
+            'paragraph_count': tag_counts['p'],
+            'div_count': tag_counts['div'],
+            'script_count': tag_counts['script'],
+            'form_count': tag_counts['form'],
+            'table_count': tag_counts['table'],
+            # Detect potential content areas
+            'content_areas': content_areas
         }
         
-        # Detect potential content areas
-        content_indicators = [
-            r'class=["\'][^"\']*content[^"\']*["\']',
-            r'class=["\'][^"\']*article[^"\']*["\']',
-            r'class=["\'][^"\']*post[^"\']*["\']',
-            r'class=["\'][^"\']*main[^"\']*["\']'
-        ]
+        return analysis
+    
+    def _parse(self, html_content, url, content_type=''):
+        """Run every extractor over a page, parsing it once with lxml when available."""
+        # Structure analysis is meaningless for JSON, XML or plain-text responses
+        media_type = content_type.split(';')[0].strip().lower()
+        analyze_structure = not media_type or media_type in HTML_CONTENT_TYPES
         
-        analysis['content_areas'] = sum(
-            len(re.findall(pattern, html_content, re.IGNORECASE))
-            for pattern in content_indicators
-        )
+        tree = self._build_tree(html_content)
+        if tree is not None:
+            return self._parse_tree(tree, url, analyze_structure)
         
-        return analysis
+        text_content, text_length, text_truncated = self.extract_text_content(html_content)
+        return {
+            'title': self.extract_title(html_content),
+            'meta_description': self.extract_meta_description(html_content),
+            'headings': self.extract_headings(html_content),
+            'links': self.extract_links(html_content, url),
+            'images': self.extract_images(html_content, url),
+            'text_content': text_content,
+            'text_length': text_length,
+            'text_truncated': text_truncated,
+            'content_structure': (
+                self.analyze_content_structure(html_content)
+                if analyze_structure else _empty_structure()
+            ),
+            'extraction_method': 'advanced_regex_parsing'
+        }
+    
+    def _build_tree(self, html_content):
+        """Parse HTML into an lxml tree, or return None to use the regex extractors."""
+        if lxml_html is None or not html_content.strip():
+            return None
+        
+        try:
+            try:
+                return lxml_html.document_fromstring(html_content)
+            except ValueError:
+                # str input may not carry an XML encoding declaration; re-parse as UTF-8 bytes
+                parser = lxml_html.HTMLParser(encoding='utf-8')
+                return lxml_html.document_fromstring(html_content.encode('utf-8'), parser=parser)
+        except etree.LxmlError:
+            return None
+    
+    def _parse_tree(self, tree, url, analyze_structure=True):
+        """Extract every field from an lxml document tree."""
+        # Only the document title; <title> also appears inside inline SVG in the body
+        title = tree.findtext('head/title')
+        
+        headings = []
+        for level in range(1, 7):
+            for element in islice(tree.iter(f'h{level}'), 5):  # Limit to 5 per level
+                clean_text = element.text_content().strip()
+                if clean_text:
+                    headings.append({
+                        'level': level,
+                        'text': clean_text[:200]
+                    })
+        
+        links = []
+        for element in islice(tree.iterfind('.//a[@href]'), 20):  # Limit to 20 links
+            href = element.get('href')
+            clean_text = element.text_content().strip()
+            if clean_text and href:
+                links.append({
+                    'url': href if href.startswith('http') else urljoin(url, href),
+                    'text': clean_text[:100]
+                })
+        
+        images = []
+        for element in islice(tree.iterfind('.//img[@src]'), 10):  # Limit to 10 images
+            src = element.get('src')
+            if src:
+                images.append({
+                    'src': src if src.startswith('http') else urljoin(url, src),
+                    'alt': element.get('alt', '')
+                })
+        
+        # Structure is read before script/style elements are stripped for the text
+        if analyze_structure:
+            content_structure = self._tree_structure(tree)
+        else:
+            content_structure = _empty_structure()
+        
+        etree.strip_elements(tree, 'script', 'style', with_tail=False)
+        text_content, text_length, text_truncated = _text_preview(tree.itertext(), TEXT_PREVIEW_CHARS)
+        
+        return {
+            'title': title.strip() if title is not None else "No title found",
+            'meta_description': tree.xpath(
+                'string(//meta[translate(@name, "DESCRIPTION", "description")="description"]/@content)'
+            ).strip(),
+            'headings': headings,
+            'links': links,
+            'images': images,
+            'text_content': text_content,
+            'text_length': text_length,
+            'text_truncated': text_truncated,
+            'content_structure': content_structure,
+            'extraction_method': 'lxml_parsing'
+        }
+    
+    def _tree_structure(self, tree):
+        """Analyze the structure of an lxml document tree."""
+        # Count tags and content-area classes in one walk
+        tag_counts = {}
+        content_areas = 0
+        for element in tree.iter():
+            tag = element.tag
+            if not isinstance(tag, str):  # comments and processing instructions
+                continue
+            tag_counts[tag] = tag_counts.get(tag, 0) + 1
+            class_name = element.get('class')
+            if class_name:
+                class_name = class_name.lower()
+                content_areas += sum(keyword in class_name for keyword in CONTENT_AREA_KEYWORDS)
+        
+        return {
+            'has_articles': 'article' in tag_counts,
+            'has_main': 'main' in tag_counts,
+            'paragraph_count': tag_counts.get('p', 0),
+            'div_count': tag_counts.get('div', 0),
+            'script_count': tag_counts.get('script', 0),
+            'form_count': tag_counts.get('form', 0),
+            'table_count': tag_counts.get('table', 0),
+            'content_areas': content_areas
+        }
     
     def scrape_url(self, url):
         """Scrape a URL and extract comprehensive information."""
-        print(f"🌐 Scraping URL: {url}")
+        log.info("🌐 Scraping URL: %s", url)
         
         try:
             # Make request
             start_time = time.time()
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            load_time = time.time() - start_time
+            response = self.session.get(
+                url,
+                headers=self._conditional_headers(url),
+                timeout=REQUEST_TIMEOUT,
+                stream=True
+            )
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError:
+                # Streamed bodies are never read on errors; release the connection now
+                response.close()
+                raise
+            
+            # Unchanged since the cached scrape: skip the body and every extractor
+            cached = self._validator_cache.get(url)
+            if response.status_code == 304 and cached is not None:
+                response.close()
+                load_time = time.time() - start_time
+                log.info("♻️ Not modified (%.2fs), reusing cached result", load_time)
+                # Extracted fields come from the cache; response fields describe this request
+                return dict(
+                    cached['result'],
+                    status_code=response.status_code,
+                    headers=dict(response.headers),
+                    load_time=load_time,
+                    screenshot_info={
+                        'type': 'not_modified',
+                        'extracted_at': cached['result']['screenshot_info']['timestamp'],
+                        'timestamp': datetime.now().isoformat()
+                    },
+                    cache_hit=True
+                )
             
-            print(f"✅ Response received: {response.status_code} ({load_time:.2f}s)")
+            # Media bodies carry nothing the extractors can use, so don't download them
+            content_type = response.headers.get('content-type', '').lower()
+            if content_type.startswith(SKIPPED_CONTENT_TYPES):
+                response.close()
+                log.info("⏭️ Skipped body download for %s", content_type)
+                return {
+                    'success': False,
+                    'url': url,
+                    'status_code': response.status_code,
+                    'error': f"Unsupported content type: {content_type}",
+                    'error_type': 'unsupported_content'
+                }
             
-            html_content = response.text
+            html_content = self._read_text(response)
+            load_time = time.time() - start_time
+            
+            log.info("✅ Response received: %s (%.2fs)", response.status_code, load_time)
             
             # Extract all information
-            title = self.extract_title(html_content)
-            meta_description = self.extract_meta_description(html_content)
-            headings = self.extract_headings(html_content)
-            links = self.extract_links(html_content, url)
-            images = self.extract_images(html_content, url)
-            text_content = self.extract_text_content(html_content)
-            structure_analysis = self.analyze_content_structure(html_content)
+            parsed = self._parse(html_content, url, content_type)
+            links = parsed['links']
+            images = parsed['images']
             
             # Create a "screenshot" placeholder (since we can't take real screenshots)
-            screenshot_info = self.create_screenshot_placeholder(url, response)
+            screenshot_info = self.create_screenshot_placeholder(url, response, html_content)
             
             result = {
                 'success': True,
                 'url': url,
                 'status_code': response.status_code,
                 'load_time': load_time,
-                'title': title,
-                'meta_description': meta_description,
-                'headings': headings,
+                'title': parsed['title'],
+                'meta_description': parsed['meta_description'],
+                'headings': parsed['headings'],
                 'links': links,
                 'images': images,
-                'text_content': text_content[:2000] + "..." if len(text_content) > 2000 else text_content,
-                'text_length': len(text_content),
-                'content_structure': structure_analysis,
+                'text_content': parsed['text_content'],
+                'text_length': parsed['text_length'],
+                # text_length is a lower bound when the preview stopped reading early
+                'text_truncated': parsed['text_truncated'],
+                'content_structure': parsed['content_structure'],
                 'screenshot_info': screenshot_info,
                 'headers': dict(response.headers),
-                'extraction_method': 'advanced_regex_parsing',
-                'capabilities_used': [
-                    'http_requests',
-                    'regex_parsing',
-                    'content_analysis',
-                    'link_extraction',
-                    'image_extraction',
-                    'structure_analysis'
-                ]
+                'extraction_method': parsed['extraction_method'],
+                'capabilities_used': CAPABILITIES_USED[parsed['extraction_method']]
             }
             
-            print(f"✅ Extraction completed: {len(text_content)} chars, {len(links)} links, {len(images)} images")
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self._store_validators(url, etag, last_modified, result)
+            
+            log.info(
+                "✅ Extraction completed: %s%d chars, %d links, %d images",
+                '≥' if parsed['text_truncated'] else '', parsed['text_length'], len(links), len(images)
+            )
             return result
             
         except requests.exceptions.RequestException as e:
-            print(f"❌ Request failed: {e}")
+            log.error("❌ Request failed: %s", e)
             return {
                 'success': False,
                 'url': url,
@@ -207,7 +686,7 @@ class ReliableScraper:
                 'error_type': 'request_error'
             }
         except Exception as e:
-            print(f"❌ Extraction failed: {e}")
+            log.error("❌ Extraction failed: %s", e)
             return {
                 'success': False,
                 'url': url,
@@ -215,110 +694,178 @@ class ReliableScraper:
                 'error_type': 'extraction_error'
             }
     
-    def create_screenshot_placeholder(self, url, response):
+    def _read_text(self, response):
+        """Read a streamed body up to MAX_RESPONSE_BYTES and decode it once."""
+        body = bytearray()
+        try:
+            for chunk in response.iter_content(chunk_size=65536):
+                body.extend(chunk)
+                if len(body) >= MAX_RESPONSE_BYTES:
+                    del body[MAX_RESPONSE_BYTES:]
+                    break
+        finally:
+            response.close()
+        
+        try:
+            return body.decode(response.encoding or 'utf-8', errors='replace')
+        except LookupError:  # unknown charset in Content-Type
+            return body.decode('utf-8', errors='replace')
+    
+    def scrape_many(self, urls, max_concurrency=5):
+        """Scrape several URLs concurrently over the shared session.
+
+        Requests to any one host are capped at PER_HOST_CONCURRENCY and spaced
+        by PER_HOST_MIN_DELAY. Results are returned in the same order as ``urls``.
+        """
+        urls = list(urls)
+        if not urls:
+            return []
+        
+        workers = max(1, min(max_concurrency, len(urls)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._scrape_paced, urls))
+    
+    def _scrape_paced(self, url):
+        """Scrape a URL within its host's concurrency and pacing limits."""
+        host = urlparse(url).netloc
+        with self._host_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(PER_HOST_CONCURRENCY)
+        
+        with slot:
+            # Reserve the next start time for this host, then wait for it outside the lock
+            with self._host_lock:
+                now = time.monotonic()
+                start = max(now, self._next_hit.get(host, now))
+                self._next_hit[host] = start + PER_HOST_MIN_DELAY
+            if start > now:
+                time.sleep(start - now)
+            return self.scrape_url(url)
+    
+    def create_screenshot_placeholder(self, url, response, html_content):
         """Create a screenshot placeholder with page info."""
-        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
-        filename = f"page-info-{timestamp}.txt"
+        # One clock read keeps the filename, file body and returned info consistent
+        now = datetime.now()
+        now_iso = now.isoformat()
+        timestamp = now.strftime('%Y%m%d-%H%M%S')
+        url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()[:8]
+        filename = f"page-info-{timestamp}-{url_hash}-{next(self._page_info_seq)}.txt"
         filepath = Path("screenshots") / filename
+        _ensure_dirs()
         
-        # Create detailed page info file
-        page_info = f"""
+        # Write the page info file section by section rather than building it in memory
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(f"""
 SENSORY NEURONS - PAGE ANALYSIS
 ===============================
 URL: {url}
-Timestamp: {datetime.now().isoformat()}
+Timestamp: {now_iso}
 Status Code: {response.status_code}
-Content Length: {len(response.text)} characters
+Content Length: {len(html_content)} characters
 Content Type: {response.headers.get('content-type', 'unknown')}
 
 RESPONSE HEADERS:
 {'-' * 20}
-"""
-        
-        for key, value in response.headers.items():
-            page_info += f"{key}: {value}\n"
-        
-        page_info += f"""
+""")
+            f.writelines(f"{key}: {value}\n" for key, value in response.headers.items())
+            f.write(f"""
 CONTENT PREVIEW:
 {'-' * 20}
-{response.text[:500]}...
+{html_content[:500]}...
 
 ANALYSIS COMPLETE
 Generated by Sensory Neurons Advanced Scraper
-"""
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(page_info)
+""")
+            size = f.tell()
         
         return {
             'type': 'page_analysis',
             'filename': filename,
             'filepath': str(filepath),
-            'size': len(page_info),
-            'timestamp': datetime.now().isoformat()
+            'size': size,
+            'timestamp': now_iso
         }
 
 def main():
     """Main scraping function."""
-    print("🧠 SENSORY NEURONS - RELIABLE SCRAPER")
-    print("=" * 50)
+    # An unrecognised LOG_LEVEL must not stop the job before results are written
+    log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
+    if log_level not in logging.getLevelNamesMapping():
+        log_level = 'INFO'
+    logging.basicConfig(
+        level=log_level,
+        format='%(asctime)s %(levelname)s %(message)s'
+    )
+    log.info("🧠 SENSORY NEURONS - RELIABLE SCRAPER")
     
     # Get environment variables
     target_url = os.getenv('TARGET_URL', 'https://example.com')
     hub_url = os.getenv('SYNAPSE_HUB_URL')
     api_key = os.getenv('SENSORY_API_KEY')
     priority = os.getenv('PRIORITY', 'normal')
+    debug = bool(os.getenv('DEBUG'))
     
-    print(f"Target URL: {target_url}")
-    print(f"Hub URL: {hub_url}")
-    print(f"Priority: {priority}")
+    log.info("Target URL: %s", target_url)
+    log.info("Hub URL: %s", hub_url)
+    log.info("Priority: %s", priority)
     
-    # Create result structure
+    # Create result structure; job_id and timestamp share one clock read
+    now = datetime.now()
     result = {
-        "job_id": f"sensory-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
+        "job_id": f"sensory-{now.strftime('%Y%m%d-%H%M%S')}",
         "url": target_url,
         "status": "started",
         "component": "sensory-neurons-reliable",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now.isoformat(),
         "priority": priority,
         "data": {},
         "metadata": {}
     }
     
+    scraper = None
     try:
         # Initialize scraper
         scraper = ReliableScraper()
         
         # Perform scraping
-        print("\n🔍 Starting advanced content extraction...")
+        log.info("🔍 Starting advanced content extraction...")
         scrape_result = scraper.scrape_url(target_url)
         
         if scrape_result['success']:
             result.update({
                 "status": "completed",
                 "data": scrape_result,
-                "extraction_method": "advanced_regex_parsing"
+                "extraction_method": scrape_result['extraction_method']
             })
-            print("✅ Scraping completed successfully!")
+            log.info("✅ Scraping completed successfully!")
         else:
             result.update({
                 "status": "failed",
                 "data": scrape_result,
                 "error": scrape_result.get('error', 'Unknown error')
             })
-            print("❌ Scraping failed")
+            log.error("❌ Scraping failed")
         
     except Exception as e:
-        print(f"💥 Critical error: {e}")
+        log.error("💥 Critical error: %s", e)
         result.update({
             "status": "failed",
             "error": str(e)
         })
     
-    # Add metadata
+    # The validator cache is only an optimisation; failing to save it must not fail the job
+    if scraper is not None:
+        try:
+            scraper.save_validator_cache()
+        except (OSError, TypeError) as e:
+            log.warning("⚠️ Could not save validator cache: %s", e)
+    
+    # Add metadata, describing the extraction path that actually ran
+    extraction_method = result.get("extraction_method", DEFAULT_EXTRACTION_METHOD)
     result["metadata"] = {
         "learning_insights": {
-            "extraction_method": "regex_based_parsing",
+            "extraction_method": LEARNING_INSIGHT_METHODS[extraction_method],
             "reliability": "high",
             "github_actions_compatible": True,
             "browser_automation": False
@@ -328,46 +875,39 @@ def main():
             "memory_usage": "low",
             "success_rate": 1.0 if result["status"] == "completed" else 0.0
         },
-        "capabilities": [
-            "HTTP requests with session management",
-            "Advanced regex-based content extraction",
-            "Title and meta description extraction",
-            "Heading structure analysis",
-            "Link and image extraction",
-            "Content structure analysis",
-            "Response header analysis"
-        ]
+        "capabilities": CAPABILITIES[extraction_method]
     }
     
+    # Start the hub callback first so its round trip overlaps the results.json write
+    callback = None
+    if hub_url and api_key:
+        log.info("📡 Sending results to hub...")
+        executor = ThreadPoolExecutor(max_workers=1)
+        callback = executor.submit(send_callback, hub_url, api_key, result)
+        executor.shutdown(wait=False)
+    
     # Save results
-    print("\n💾 Saving results...")
-    with open("results.json", "w") as f:
-        json.dump(result, f, indent=2)
+    log.info("💾 Saving results...")
+    # Compact output unless DEBUG asks for a human-readable file
+    Path("results.json").write_bytes(dump_json(result, indent=debug))
     
-    print("📄 Results saved to results.json")
+    log.info("📄 Results saved to results.json")
     
-    # Send callback to hub
-    if hub_url and api_key:
+    # Wait for the hub callback
+    if callback is not None:
         try:
-            print("📡 Sending results to hub...")
-            callback_response = requests.post(
-                f"{hub_url}/api/v1/callbacks/sensory",
-                json=result,
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json"
-                },
-                timeout=30
-            )
+            callback_response = callback.result()
             if callback_response.status_code == 200:
-                print("📡 Callback sent successfully!")
+                log.info("📡 Callback sent successfully!")
             else:
-                print(f"⚠️ Callback failed: {callback_response.status_code}")
+                log.warning("⚠️ Callback failed: %s", callback_response.status_code)
         except Exception as e:
-            print(f"⚠️ Callback error: {e}")
+            log.warning("⚠️ Callback error: %s", e)
+    
+    close_session()
     
-    print(f"\n🎯 Job completed: {result['status']}")
-    print("✅ All files created successfully")
+    log.info("🎯 Job completed: %s", result['status'])
+    log.info("✅ All files created successfully")
 
 if __name__ == "__main__":
     main()